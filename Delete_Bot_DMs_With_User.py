@@ -5,6 +5,7 @@
 import argparse
 import asyncio
 import getpass
+import json
 import os
 import sys
 from collections.abc import Awaitable, Callable
@@ -25,6 +26,14 @@ try:
 except ImportError:
     readline = None
 
+try:
+    import uvloop  # pyright: ignore[reportMissingImports]
+
+    # 2-4x faster asyncio socket I/O; unavailable on Windows.
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 T = TypeVar("T")
 RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504, 524}
 TRANSIENT_HTTP_MARKERS = (
@@ -56,6 +65,70 @@ def is_retryable_http_exception(exc: HTTPException) -> bool:
     return any(marker in message for marker in TRANSIENT_HTTP_MARKERS)
 
 
+def rate_limit_reset_after(exc: HTTPException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        for name in ("X-RateLimit-Reset-After", "Retry-After"):
+            raw = headers.get(name)
+            if raw:
+                try:
+                    return max(0.0, float(raw))
+                except ValueError:
+                    continue
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+class AdaptiveRateLimiter:
+    """Paces requests from rate-limit feedback or a fixed per-request delay.
+
+    One monotonic next-allowed deadline is shared by every caller, so the
+    aggregate rate honors the interval no matter how many workers run
+    concurrently. Without a fixed delay the interval stays at zero until
+    Discord reports an exhausted bucket (HTTP 429), then matches the
+    advertised reset window and halves after each clean request until it is
+    back to full speed. With a fixed delay the interval never changes, but a
+    429 still pushes the shared deadline out by the reset window.
+    """
+
+    def __init__(
+        self, verbose: Callable[[str], None], fixed_delay: float | None = None
+    ) -> None:
+        self._fixed = fixed_delay is not None
+        self.delay = fixed_delay or 0.0
+        self._next = 0.0
+        self._verbose = verbose
+
+    async def wait(self) -> None:
+        # Claim the slot before sleeping; the event loop is single-threaded,
+        # so no two workers can take the same deadline.
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(self._next, now)
+        self._next = slot + self.delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def record_success(self) -> None:
+        if not self._fixed and self.delay > 0:
+            self.delay = 0.0 if self.delay < 0.05 else self.delay / 2
+
+    def record_rate_limit(self, reset_after: float) -> None:
+        if not self._fixed:
+            self.delay = max(self.delay, reset_after, 0.1)
+        loop = asyncio.get_running_loop()
+        self._next = max(self._next, loop.time() + max(reset_after, self.delay))
+        self._verbose(
+            f"Rate limited; holding deletions for {reset_after:.2f}s, then "
+            f"pacing them {self.delay:.2f}s apart."
+        )
+
+
 async def retry_http_request(
     label: str,
     operation: Callable[[], Awaitable[T]],
@@ -64,6 +137,7 @@ async def retry_http_request(
     base_delay: float = 1.0,
     max_delay: float = 8.0,
     verbose: Callable[[str], None] | None = None,
+    on_rate_limit: Callable[[float], None] | None = None,
 ) -> T:
     last_exc: HTTPException | None = None
     for attempt in range(1, attempts + 1):
@@ -79,6 +153,12 @@ async def retry_http_request(
 
             delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
             status = getattr(exc, "status", "?")
+            if status == 429:
+                reset_after = rate_limit_reset_after(exc)
+                if reset_after is not None:
+                    delay = reset_after
+                if on_rate_limit is not None:
+                    on_rate_limit(delay)
             print(
                 f"Warning: {label} failed with HTTP {status} on attempt "
                 f"{attempt}/{attempts}; retrying in {delay:.1f}s.",
@@ -190,17 +270,50 @@ def prompt_token_with_mask(prompt: str = "Bot token: ") -> str:
         termios.tcsetattr(fd, termios.TCSADRAIN, original_settings)
 
 
+def read_token_file(path: str) -> str | None:
+    """Read a bot token from a file: plain text or JSON with a "token" key."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            raw = fh.read().strip()
+    except OSError as exc:
+        print(f"Error: Could not read token file: {exc}", file=sys.stderr)
+        return None
+    if not raw:
+        return None
+    if raw.startswith("{"):
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        token = data.get("token")
+        return token.strip() if isinstance(token, str) else None
+    return raw.splitlines()[0].strip()
+
+
 def build_argparser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="Delete this bot's messages in the DM channel with a specific user."
     )
     p.add_argument("--token", help="Bot token. If omitted, prompts.")
+    p.add_argument(
+        "--token-file",
+        help='Read the bot token from this file (plain text or JSON with a "token" key).',
+    )
     p.add_argument("--user-id", type=int, help="Target user ID (prompts if omitted).")
     p.add_argument(
         "--sleep",
         type=float,
-        default=0.0,
-        help="Delay (seconds) between deletions. Default: 0.0",
+        default=None,
+        help=(
+            "Fixed delay (seconds) between deletions. "
+            "Default: adapt to Discord's rate-limit headers."
+        ),
+    )
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Number of deletions kept in flight at once. Default: 5",
     )
     p.add_argument(
         "--scan-limit",
@@ -230,6 +343,11 @@ async def main() -> int:
     args = build_argparser().parse_args()
     verbose = build_verbose_printer(args.verbose)
     token = args.token
+    if not token and args.token_file:
+        token = read_token_file(args.token_file)
+        if not token:
+            print("Error: No bot token found in token file.", file=sys.stderr)
+            return 2
     if not token:
         try:
             token = prompt_token_with_mask("Bot token: ")
@@ -242,6 +360,9 @@ async def main() -> int:
     if args.scan_limit is not None and args.scan_limit <= 0:
         print("Error: --scan-limit must be greater than zero.", file=sys.stderr)
         return 2
+    if args.concurrency <= 0:
+        print("Error: --concurrency must be greater than zero.", file=sys.stderr)
+        return 2
 
     user_id = args.user_id
     while user_id is None:
@@ -263,11 +384,20 @@ async def main() -> int:
     intents.dm_messages = True
 
     client = discord.Client(intents=intents)
-    done = asyncio.get_running_loop().create_future()
-    stats = {"scanned": 0, "deleted": 0, "failed": 0}
+    # An Event plus closure flags signals completion; there is no value to
+    # carry, so a Future would only add a result slot and a re-raise footgun.
+    done = asyncio.Event()
+    succeeded = False
+    run_error: Exception | None = None
+    # Plain locals instead of a stats dict: the counters are bumped once per
+    # message, and closure cells skip the dict lookup on every increment.
+    scanned = 0
+    deleted = 0
+    failed = 0
 
     @client.event
     async def on_ready():
+        nonlocal succeeded, run_error
         print(f"Logged in as {client.user} (id: {client.user.id})")
         try:
             try:
@@ -279,11 +409,9 @@ async def main() -> int:
                 )
             except NotFound:
                 print("Error: Target user not found.", file=sys.stderr)
-                done.set_result(False)
                 return
             except HTTPException as exc:
                 print(f"Error: HTTP error while fetching user: {exc}", file=sys.stderr)
-                done.set_result(False)
                 return
 
             try:
@@ -298,16 +426,23 @@ async def main() -> int:
                     f"Error: Could not create or fetch DM channel: {exc}",
                     file=sys.stderr,
                 )
-                done.set_result(False)
                 return
 
+            # Bulk delete (channel.purge(bulk=True)) is guild-only; DM messages
+            # must be removed one DELETE at a time, hence the worker pipeline.
             if not isinstance(dm_channel, discord.DMChannel):
                 print("Error: Unexpected channel type, aborting.", file=sys.stderr)
-                done.set_result(False)
                 return
 
             print(f"DM channel with {user} is {dm_channel.id}. Scanning messages...")
-            if args.sleep > 0:
+            # One limiter shared by all workers, so the aggregate delete rate
+            # honors the pacing interval regardless of concurrency.
+            limiter = AdaptiveRateLimiter(verbose, fixed_delay=args.sleep)
+            if args.sleep is None:
+                verbose(
+                    "Pacing deletions adaptively from Discord's rate-limit headers."
+                )
+            elif args.sleep > 0:
                 verbose(f"Using a fixed {args.sleep:.3f}s delay between deletions.")
 
             history_before = (
@@ -327,78 +462,143 @@ async def main() -> int:
                 f" after_message_id={args.after_message_id or 'none'}."
             )
 
-            async for message in dm_channel.history(
-                limit=args.scan_limit,
-                before=history_before,
-                after=history_after,
-                oldest_first=False,
-            ):
-                stats["scanned"] += 1
-                if args.verbose and stats["scanned"] % 250 == 0:
-                    verbose(
-                        f"Scanned {stats['scanned']} messages; "
-                        f"deleted {stats['deleted']}, failed {stats['failed']}."
-                    )
-                if message.author.id != client.user.id:
-                    continue
+            concurrency = args.concurrency
+            # Bounded so a fast history scan cannot buffer the whole DM in memory
+            # while deletes lag behind.
+            queue: asyncio.Queue[discord.Message] = asyncio.Queue(maxsize=200)
+            semaphore = asyncio.Semaphore(concurrency)
 
+            async def delete_queued_message(message: discord.Message) -> None:
+                nonlocal deleted, failed
                 try:
+                    await limiter.wait()
                     await retry_http_request(
                         f"deleting message {message.id}",
                         message.delete,
                         attempts=4,
                         verbose=verbose,
+                        on_rate_limit=limiter.record_rate_limit,
                     )
-                    stats["deleted"] += 1
+                    deleted += 1
                     if args.verbose:
                         verbose(f"Deleted message {message.id}.")
-                    if args.sleep > 0:
-                        await asyncio.sleep(args.sleep)  # be gentle with rate limits
+                    limiter.record_success()
                 except NotFound:
-                    stats["deleted"] += 1
+                    deleted += 1
                     if args.verbose:
                         verbose(
                             f"Message {message.id} was already gone; treating it as deleted."
                         )
                 except Forbidden:
-                    stats["failed"] += 1
+                    failed += 1
                     print(
                         f"Forbidden: could not delete message {message.id}",
                         file=sys.stderr,
                     )
                 except HTTPException as exc:
-                    stats["failed"] += 1
+                    failed += 1
                     print(
                         f"HTTP error deleting message {message.id}: {exc}",
                         file=sys.stderr,
                     )
+                except Exception as exc:
+                    # Errors discord.py does not wrap (e.g. a dropped aiohttp
+                    # connection) must not kill the worker, or the producer
+                    # would block forever on the bounded queue with the
+                    # failure swallowed by the cancellation gather below.
+                    failed += 1
+                    print(
+                        f"Unexpected error deleting message {message.id}: {exc!r}",
+                        file=sys.stderr,
+                    )
 
-            done.set_result(True)
+            async def delete_worker() -> None:
+                while True:
+                    message = await queue.get()
+                    try:
+                        async with semaphore:
+                            await delete_queued_message(message)
+                    finally:
+                        queue.task_done()
+
+            async def scan_history() -> None:
+                nonlocal scanned
+                async for message in dm_channel.history(
+                    limit=args.scan_limit,
+                    before=history_before,
+                    after=history_after,
+                    oldest_first=False,
+                ):
+                    scanned += 1
+                    if args.verbose and scanned % 250 == 0:
+                        verbose(
+                            f"Scanned {scanned} messages; "
+                            f"deleted {deleted}, failed {failed}."
+                        )
+                    if message.author.id != client.user.id:
+                        continue
+                    await queue.put(message)
+
+            workers = [asyncio.create_task(delete_worker()) for _ in range(concurrency)]
+            producer = asyncio.create_task(scan_history())
+            verbose(
+                f"Scanning history and deleting with {concurrency} concurrent worker(s)."
+            )
+            try:
+                await producer
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+            succeeded = True
         except Exception as exc:
-            done.set_exception(exc)
+            run_error = exc
+        finally:
+            done.set()
 
-    async def run():
-        try:
-            await client.start(token)
-        except discord.LoginFailure:
-            print("Error: Invalid bot token.", file=sys.stderr)
-            return 3
-        return 0
-
-    task = asyncio.create_task(run())
-    await asyncio.wait({done}, return_when=asyncio.ALL_COMPLETED)
-    await client.close()
     try:
-        await task
-    except Exception:
-        pass
+        await client.login(token)
+    except discord.LoginFailure:
+        print("Error: Invalid bot token.", file=sys.stderr)
+        # login() already opened the HTTP session; close it or aiohttp warns
+        # about an unclosed session at exit.
+        await client.close()
+        return 3
+
+    gateway_task = asyncio.create_task(client.connect())
+
+    def propagate_gateway_failure(task: asyncio.Task) -> None:
+        # Without this, a failed gateway connection would leave `done` unset
+        # forever and the exception would be swallowed.
+        nonlocal run_error
+        if done.is_set() or task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            run_error = exc
+        done.set()
+
+    gateway_task.add_done_callback(propagate_gateway_failure)
+    try:
+        await done.wait()
+    finally:
+        gateway_task.cancel()
+        await client.close()
+        try:
+            await gateway_task
+        except (asyncio.CancelledError, Exception):
+            pass
 
-    if not done.result():
+    if run_error is not None:
+        raise run_error
+    if not succeeded:
         return 1
 
     print(
-        f"Done. Scanned {stats['scanned']} messages. Deleted {stats['deleted']} messages. "
-        f"Failed to delete {stats['failed']} messages."
+        f"Done. Scanned {scanned} messages. Deleted {deleted} messages. "
+        f"Failed to delete {failed} messages."
     )
     return 0
 
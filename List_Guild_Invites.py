@@ -4,20 +4,19 @@
 
 import argparse
 import asyncio
+import csv
 import getpass
+import io
 import json
 import os
 import sys
-from collections.abc import Awaitable, Callable
-from datetime import timedelta
-from typing import TypeVar
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from urllib.parse import quote
 
-import discord  # pyright: ignore[reportMissingImports]
-from discord.errors import (  # pyright: ignore[reportMissingImports]
-    Forbidden,
-    HTTPException,
-    NotFound,
-)
+import aiohttp  # pyright: ignore[reportMissingImports]
 
 readline = None
 try:
@@ -27,18 +26,39 @@ try:
 except ImportError:
     readline = None
 
-T = TypeVar("T")
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # pyright: ignore[reportMissingImports]
+
+    # 2-4x faster asyncio socket I/O; unavailable on Windows.
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
+API_BASE_URL = "https://discord.com/api/v10"
 RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504, 524}
-TRANSIENT_HTTP_MARKERS = (
-    "service unavailable",
-    "upstream connect error",
-    "disconnect/reset before headers",
-    "reset reason: overflow",
-    "server error",
-    "bad gateway",
-    "gateway timeout",
-    "temporarily unavailable",
-)
+TEXT_CHANNEL_TYPE = 0
+# Text, voice, announcement and stage channels accept invite creation.
+INVITE_CAPABLE_CHANNEL_TYPES = {0, 2, 5, 13}
+
+
+class RestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+def build_http_connector() -> aiohttp.TCPConnector:
+    return aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=64,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+    )
 
 
 def build_verbose_printer(enabled: bool) -> Callable[[str], None]:
@@ -49,48 +69,50 @@ def build_verbose_printer(enabled: bool) -> Callable[[str], None]:
     return verbose
 
 
-def is_retryable_http_exception(exc: HTTPException) -> bool:
-    status = getattr(exc, "status", None)
-    if status in RETRYABLE_HTTP_STATUSES:
-        return True
-
-    message = str(exc).lower()
-    return any(marker in message for marker in TRANSIENT_HTTP_MARKERS)
-
-
-async def retry_http_request(
-    label: str,
-    operation: Callable[[], Awaitable[T]],
+async def rest_request(
+    session: aiohttp.ClientSession,
+    method: str,
+    path: str,
     *,
+    json_body: dict | None = None,
+    headers: dict[str, str] | None = None,
+    label: str,
     attempts: int = 5,
     base_delay: float = 1.0,
     max_delay: float = 8.0,
     verbose: Callable[[str], None] | None = None,
-) -> T:
-    last_exc: HTTPException | None = None
+) -> Any:
     for attempt in range(1, attempts + 1):
-        try:
-            result = await operation()
-            if attempt > 1 and verbose is not None:
-                verbose(f"{label} succeeded on attempt {attempt}/{attempts}.")
-            return result
-        except HTTPException as exc:
-            last_exc = exc
-            if attempt >= attempts or not is_retryable_http_exception(exc):
-                raise
-
+        async with session.request(
+            method, API_BASE_URL + path, json=json_body, headers=headers
+        ) as resp:
+            if resp.status < 400:
+                data = await resp.json()
+                if attempt > 1 and verbose is not None:
+                    verbose(f"{label} succeeded on attempt {attempt}/{attempts}.")
+                return data
+            message = await resp.text()
+            if attempt >= attempts or resp.status not in RETRYABLE_HTTP_STATUSES:
+                raise RestError(resp.status, message)
             delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
-            status = getattr(exc, "status", "?")
+            if resp.status == 429:
+                # Honor the server's advertised wait instead of guessing.
+                raw = resp.headers.get("X-RateLimit-Reset-After") or resp.headers.get(
+                    "Retry-After"
+                )
+                if raw:
+                    try:
+                        delay = max(0.0, float(raw))
+                    except ValueError:
+                        pass
             print(
-                f"Warning: {label} failed with HTTP {status} on attempt "
+                f"Warning: {label} failed with HTTP {resp.status} on attempt "
                 f"{attempt}/{attempts}; retrying in {delay:.1f}s.",
                 file=sys.stderr,
             )
-            await asyncio.sleep(delay)
+        await asyncio.sleep(delay)
 
-    if last_exc is not None:
-        raise last_exc
-    raise RuntimeError(f"retry_http_request exhausted attempts for {label}")
+    raise RuntimeError(f"rest_request exhausted attempts for {label}")
 
 
 def configure_line_editing() -> None:
@@ -192,11 +214,35 @@ def prompt_token_with_mask(prompt: str = "Bot token: ") -> str:
         termios.tcsetattr(fd, termios.TCSADRAIN, original_settings)
 
 
+def read_token_file(path: str) -> str | None:
+    """Read a bot token from a file: plain text or JSON with a "token" key."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            raw = fh.read().strip()
+    except OSError as exc:
+        print(f"Error: Could not read token file: {exc}", file=sys.stderr)
+        return None
+    if not raw:
+        return None
+    if raw.startswith("{"):
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        token = data.get("token")
+        return token.strip() if isinstance(token, str) else None
+    return raw.splitlines()[0].strip()
+
+
 def build_argparser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="List active invite links for a Discord guild (server), optionally create one."
     )
     p.add_argument("--token", help="Bot token. If omitted, prompts.")
+    p.add_argument(
+        "--token-file",
+        help='Read the bot token from this file (plain text or JSON with a "token" key).',
+    )
     p.add_argument(
         "--guild-id", type=int, help="Target guild (server) ID (prompts if omitted)."
     )
@@ -249,6 +295,12 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument(
         "--reason", default=None, help="Audit log reason for creating the invite."
     )
+    p.add_argument(
+        "--retry-max",
+        type=int,
+        default=5,
+        help="Max attempts for fetching invites when rate limited. Default: 5.",
+    )
     p.add_argument(
         "--verbose",
         action="store_true",
@@ -257,76 +309,174 @@ def build_argparser() -> argparse.ArgumentParser:
     return p
 
 
-def invite_record(inv: discord.Invite) -> dict:
+@dataclass(slots=True)
+class InviteRecord:
+    """One parsed invite; slots keep per-record storage a fixed-offset array."""
+
+    code: str | None
+    url: str | None
+    channel_id: int | None
+    channel_name: str | None
+    inviter_id: int | None
+    inviter_name: str | None
+    uses: int | None
+    max_uses: int | None
+    temporary: bool | None
+    revoked: bool
+    max_age_seconds: int | None
+    created_at: str | None
+    expires_at: str | None
+
+
+def invite_record(inv: dict) -> InviteRecord:
+    channel = inv.get("channel") or {}
+    inviter = inv.get("inviter") or {}
+    code = inv.get("code")
+    max_age = inv.get("max_age")
+
+    created_at = None
+    raw_created = inv.get("created_at")
+    if raw_created:
+        try:
+            created_at = datetime.fromisoformat(raw_created)
+        except ValueError:
+            created_at = None
+
     expires_at = None
-    try:
-        if inv.max_age and inv.max_age > 0 and inv.created_at:
-            expires_at = inv.created_at + timedelta(seconds=inv.max_age)
-    except Exception:
-        expires_at = None
-
-    return {
-        "code": inv.code,
-        "url": inv.url,
-        "channel_id": getattr(inv.channel, "id", None),
-        "channel_name": getattr(inv.channel, "name", None),
-        "inviter_id": getattr(inv.inviter, "id", None),
-        "inviter_name": (
-            getattr(inv.inviter, "name", None)
-            if getattr(inv, "inviter", None)
-            else None
-        ),
-        "uses": inv.uses,
-        "max_uses": inv.max_uses,
-        "temporary": inv.temporary,
-        "revoked": getattr(inv, "revoked", False),
-        "max_age_seconds": inv.max_age,
-        "created_at": inv.created_at.isoformat() if inv.created_at else None,
-        "expires_at": expires_at.isoformat() if expires_at else None,
+    if max_age and max_age > 0 and created_at:
+        expires_at = created_at + timedelta(seconds=max_age)
+
+    return InviteRecord(
+        code=code,
+        url=f"https://discord.gg/{code}" if code else None,
+        channel_id=int(channel["id"]) if channel.get("id") else None,
+        channel_name=channel.get("name"),
+        inviter_id=int(inviter["id"]) if inviter.get("id") else None,
+        inviter_name=inviter.get("username"),
+        uses=inv.get("uses"),
+        max_uses=inv.get("max_uses"),
+        temporary=inv.get("temporary"),
+        revoked=inv.get("revoked", False),
+        max_age_seconds=max_age,
+        created_at=created_at.isoformat() if created_at else None,
+        expires_at=expires_at.isoformat() if expires_at else None,
+    )
+
+
+INVITE_CSV_HEADERS = [
+    "url",
+    "code",
+    "channel_id",
+    "channel_name",
+    "inviter_id",
+    "inviter_name",
+    "uses",
+    "max_uses",
+    "temporary",
+    "revoked",
+    "max_age_seconds",
+    "created_at",
+    "expires_at",
+]
+
+
+def _write_json(
+    invites: list[InviteRecord], created: InviteRecord | None, stream
+) -> None:
+    out = {
+        "created_invite": asdict(created) if created else None,
+        "invites": [asdict(r) for r in invites],
     }
+    if orjson is not None:
+        stream.buffer.write(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+        stream.buffer.write(b"\n")
+    else:
+        json.dump(out, stream, indent=2)
+        stream.write("\n")
+
+
+def _write_csv(
+    invites: list[InviteRecord], created: InviteRecord | None, stream
+) -> None:
+    # Buffer the whole block so thousands of rows become a single write().
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(INVITE_CSV_HEADERS)
+    writer.writerows(
+        [
+            r.url or "",
+            r.code or "",
+            r.channel_id or "",
+            r.channel_name or "",
+            r.inviter_id or "",
+            r.inviter_name or "",
+            r.uses or 0,
+            r.max_uses or 0,
+            bool(r.temporary),
+            bool(r.revoked),
+            r.max_age_seconds or 0,
+            r.created_at or "",
+            r.expires_at or "",
+        ]
+        for r in invites
+    )
+    stream.write(buf.getvalue())
+    if created:
+        sys.stderr.write(f"Created invite: {created.url}\n")
+
+
+def _write_text(
+    invites: list[InviteRecord], created: InviteRecord | None, stream
+) -> None:
+    # Buffer the whole block so thousands of rows become a single write().
+    buf = io.StringIO()
+    if created:
+        buf.write(f"Created invite: {created.url}\n")
+    if not invites:
+        buf.write("No active invites found.\n")
+    else:
+        for r in invites:
+            line = (
+                f"{r.url}  channel={r.channel_name} uses={r.uses}/{r.max_uses or '∞'}"
+            )
+            if r.expires_at:
+                line += f" expires_at={r.expires_at}"
+            buf.write(" • " + line + "\n")
+    stream.write(buf.getvalue())
 
 
-async def choose_channel_for_invite(
-    guild: discord.Guild,
+WRITERS = {"json": _write_json, "csv": _write_csv, "text": _write_text}
+
+
+def choose_channel_for_invite(
+    channels: list[dict],
+    system_channel_id: int | None,
     preferred_id: int | None,
     verbose: Callable[[str], None],
-) -> discord.abc.GuildChannel | None:
+) -> dict | None:
     if preferred_id:
-
-        async def fetch_preferred_channel() -> discord.abc.GuildChannel | None:
-            fetched_channel = await guild.fetch_channel(preferred_id)
-            if isinstance(fetched_channel, discord.Thread):
-                return None
-            return fetched_channel
-
-        try:
-            ch: discord.abc.GuildChannel | None = guild.get_channel(preferred_id)
-            if ch is None:
-                verbose(f"Fetching preferred invite channel {preferred_id}.")
-                ch = await retry_http_request(
-                    "fetching preferred invite channel",
-                    fetch_preferred_channel,
-                    verbose=verbose,
-                )
-            return ch
-        except (NotFound, Forbidden, HTTPException):
-            return None
-    system_channel = guild.system_channel
-    if system_channel is not None:
-        verbose(f"Using system channel {system_channel.id} for invite creation.")
-        return system_channel
-    for ch in sorted(guild.text_channels, key=lambda c: (c.position, c.id)):
-        if ch is None:
-            continue
-        verbose(f"Using text channel {ch.id} for invite creation.")
-        return ch
-    for ch in guild.channels:
-        if hasattr(ch, "create_invite"):
-            verbose(
-                f"Using fallback channel {getattr(ch, 'id', 'unknown')} for invite creation."
-            )
-            return ch
-    return None
+        return next((c for c in channels if int(c["id"]) == preferred_id), None)
+    if system_channel_id is not None:
+        system_channel = next(
+            (c for c in channels if int(c["id"]) == system_channel_id), None
+        )
+        if system_channel is not None:
+            verbose(f"Using system channel {system_channel_id} for invite creation.")
+            return system_channel
+    first_text = min(
+        (c for c in channels if c.get("type") == TEXT_CHANNEL_TYPE),
+        key=lambda c: (c.get("position", 0), int(c["id"])),
+        default=None,
+    )
+    if first_text is not None:
+        verbose(f"Using text channel {first_text['id']} for invite creation.")
+        return first_text
+    fallback = next(
+        (c for c in channels if c.get("type") in INVITE_CAPABLE_CHANNEL_TYPES), None
+    )
+    if fallback is not None:
+        verbose(f"Using fallback channel {fallback['id']} for invite creation.")
+    return fallback
 
 
 def prompt_for_int(prompt_text: str) -> int | None:
@@ -347,6 +497,11 @@ async def main() -> int:
     args = build_argparser().parse_args()
     verbose = build_verbose_printer(args.verbose)
     token = args.token
+    if not token and args.token_file:
+        token = read_token_file(args.token_file)
+        if not token:
+            print("Error: No bot token found in token file.", file=sys.stderr)
+            return 2
     if not token:
         try:
             token = prompt_token_with_mask("Bot token: ")
@@ -357,6 +512,10 @@ async def main() -> int:
         print("Error: No bot token provided.", file=sys.stderr)
         return 2
 
+    if args.retry_max <= 0:
+        print("Error: --retry-max must be greater than zero.", file=sys.stderr)
+        return 2
+
     guild_id = args.guild_id
     if guild_id is None:
         guild_id = prompt_for_int("Guild ID: ")
@@ -364,179 +523,135 @@ async def main() -> int:
         print("Error: No guild ID provided.", file=sys.stderr)
         return 2
 
-    intents = discord.Intents.none()
-    intents.guilds = True
-
-    client = discord.Client(intents=intents)
-    done = asyncio.get_running_loop().create_future()
-    results = {"guild_id": guild_id, "invites": [], "created_invite": None}
+    # Listing and creating invites are plain REST calls; connecting the
+    # gateway would only add the IDENTIFY round-trip and the guild cache.
+    async with aiohttp.ClientSession(
+        connector=build_http_connector(),
+        headers={"Authorization": f"Bot {token}"},
+    ) as session:
+        try:
+            verbose(f"Fetching guild {guild_id} over REST.")
+            guild = await rest_request(
+                session,
+                "GET",
+                f"/guilds/{guild_id}",
+                label="fetching guild",
+                verbose=verbose,
+            )
+        except RestError as exc:
+            if exc.status == 401:
+                print("Error: Invalid bot token.", file=sys.stderr)
+                return 3
+            print(
+                "Error: Bot is not in that guild or cannot access it.",
+                file=sys.stderr,
+            )
+            return 1
+        verbose(f"Using guild {guild.get('name')} ({guild_id}).")
 
-    @client.event
-    async def on_ready():
+        invites: list[dict] = []
         try:
-            verbose(f"Logged in as {client.user} (id: {client.user.id})")
-            guild = client.get_guild(guild_id)
-            if guild is None:
-                try:
-                    verbose(f"Fetching guild {guild_id} from the API.")
-                    guild = await retry_http_request(
-                        "fetching guild",
-                        lambda: client.fetch_guild(guild_id),
-                        verbose=verbose,
-                    )
-                except HTTPException:
-                    guild = None
+            verbose(f"Fetching invites for guild {guild_id}.")
+            invites = await rest_request(
+                session,
+                "GET",
+                f"/guilds/{guild_id}/invites",
+                label="fetching guild invites",
+                attempts=args.retry_max,
+                verbose=verbose,
+            )
+        except RestError as exc:
+            if exc.status == 403:
+                invites = []
             else:
-                verbose(f"Using cached guild {guild.name} ({guild.id}).")
-
-            if guild is None:
                 print(
-                    "Error: Bot is not in that guild or cannot access it.",
-                    file=sys.stderr,
+                    f"Error: HTTP error when fetching invites: {exc}", file=sys.stderr
                 )
-                done.set_result(False)
-                return
+        else:
+            verbose(f"Fetched {len(invites)} invite(s).")
 
-            invites = []
+        should_create = args.create and (not args.only_if_none or len(invites) == 0)
+        created_rec = None
+        if should_create:
+            channels: list[dict] = []
             try:
-                verbose(f"Fetching invites for guild {guild.id}.")
-                invites = await retry_http_request(
-                    "fetching guild invites",
-                    guild.invites,
+                verbose(f"Fetching channels for guild {guild_id}.")
+                channels = await rest_request(
+                    session,
+                    "GET",
+                    f"/guilds/{guild_id}/channels",
+                    label="fetching guild channels",
                     verbose=verbose,
                 )
-            except Forbidden:
-                invites = []
-            except HTTPException as e:
-                print(f"Error: HTTP error when fetching invites: {e}", file=sys.stderr)
-            else:
-                verbose(f"Fetched {len(invites)} invite(s).")
+            except RestError as exc:
+                print(
+                    f"Error: HTTP error when fetching channels: {exc}", file=sys.stderr
+                )
 
-            should_create = args.create and (not args.only_if_none or len(invites) == 0)
-            created_rec = None
-            if should_create:
-                channel = await choose_channel_for_invite(
-                    guild, args.channel_id, verbose
+            raw_system_id = guild.get("system_channel_id")
+            channel = choose_channel_for_invite(
+                channels,
+                int(raw_system_id) if raw_system_id else None,
+                args.channel_id,
+                verbose,
+            )
+            if channel is None:
+                print(
+                    "Error: Could not resolve a channel to create an invite in.",
+                    file=sys.stderr,
                 )
-                if channel is None:
-                    print(
-                        "Error: Could not resolve a channel to create an invite in.",
-                        file=sys.stderr,
+            else:
+                extra_headers = None
+                if args.reason:
+                    extra_headers = {
+                        "X-Audit-Log-Reason": quote(args.reason, safe="/ ")
+                    }
+                try:
+                    verbose(f"Creating invite in channel {channel['id']}.")
+                    new_inv = await rest_request(
+                        session,
+                        "POST",
+                        f"/channels/{channel['id']}/invites",
+                        json_body={
+                            "max_age": args.max_age,
+                            "max_uses": args.max_uses,
+                            "temporary": args.temporary,
+                            "unique": args.unique,
+                        },
+                        headers=extra_headers,
+                        label="creating invite",
+                        # Creating an invite is not idempotent: a retry after
+                        # a timeout or 5xx could mint a duplicate.
+                        attempts=1,
+                        verbose=verbose,
                     )
-                else:
-                    try:
-                        verbose(f"Creating invite in channel {channel.id}.")
-                        new_inv = await channel.create_invite(
-                            max_age=args.max_age,
-                            max_uses=args.max_uses,
-                            temporary=args.temporary,
-                            unique=args.unique,
-                            reason=args.reason,
-                        )
-                        created_rec = invite_record(new_inv)
-                        invites.append(new_inv)
-                    except Forbidden:
+                except RestError as exc:
+                    if exc.status == 403:
                         print(
                             "Error: Forbidden creating invite. Ensure the bot has CREATE_INSTANT_INVITE on that channel.",
                             file=sys.stderr,
                         )
-                    except HTTPException as e:
+                    else:
                         print(
-                            f"Error: HTTP error when creating invite: {e}",
+                            f"Error: HTTP error when creating invite: {exc}",
                             file=sys.stderr,
                         )
-
-            for inv in invites:
-                rec = invite_record(inv)
-                if not args.include_revoked and rec.get("revoked"):
-                    continue
-                results["invites"].append(rec)
-
-            if created_rec:
-                results["created_invite"] = created_rec
-
-            results["invites"].sort(
-                key=lambda r: (r.get("channel_name") or "", r.get("code") or "")
-            )
-            done.set_result(True)
-        except Exception as exc:
-            done.set_exception(exc)
-
-    async def run():
-        try:
-            await client.start(token)
-        except discord.LoginFailure:
-            print("Error: Invalid bot token.", file=sys.stderr)
-            return 3
-        return 0
-
-    task = asyncio.create_task(run())
-    await asyncio.wait({done}, return_when=asyncio.ALL_COMPLETED)
-    await client.close()
-    try:
-        await task
-    except Exception:
-        pass
-
-    if not done.result():
-        return 1
-
-    fmt = args.format
-    invites = results["invites"]
-    created = results["created_invite"]
-
-    if fmt == "json":
-        out = {"created_invite": created, "invites": invites}
-        json.dump(out, sys.stdout, indent=2)
-        print()
-    elif fmt == "csv":
-        headers = [
-            "url",
-            "code",
-            "channel_id",
-            "channel_name",
-            "inviter_id",
-            "inviter_name",
-            "uses",
-            "max_uses",
-            "temporary",
-            "revoked",
-            "max_age_seconds",
-            "created_at",
-            "expires_at",
-        ]
-        print(",".join(headers))
-        for r in invites:
-            row = [
-                r.get("url") or "",
-                r.get("code") or "",
-                str(r.get("channel_id") or ""),
-                (r.get("channel_name") or "").replace(",", " "),
-                str(r.get("inviter_id") or ""),
-                (r.get("inviter_name") or "").replace(",", " "),
-                str(r.get("uses") or 0),
-                str(r.get("max_uses") or 0),
-                str(bool(r.get("temporary"))),
-                str(bool(r.get("revoked"))),
-                str(r.get("max_age_seconds") or 0),
-                r.get("created_at") or "",
-                r.get("expires_at") or "",
-            ]
-            print(",".join(row))
-        if created:
-            sys.stderr.write(f"Created invite: {created['url']}\n")
-    else:
-        if created:
-            print(f"Created invite: {created['url']}")
-        if not invites:
-            print("No active invites found.")
-        else:
-            for r in invites:
-                line = f"{r['url']}  channel={r.get('channel_name')} uses={r.get('uses')}/{r.get('max_uses') or '∞'}"
-                if r.get("expires_at"):
-                    line += f" expires_at={r['expires_at']}"
-                print(" • " + line)
-
+                else:
+                    created_rec = invite_record(new_inv)
+                    invites.append(new_inv)
+
+    # Parse and filter in a single pass over the raw list instead of building
+    # an intermediate record list and walking it again.
+    records = [
+        rec
+        for rec in map(invite_record, invites)
+        if args.include_revoked or not rec.revoked
+    ]
+    # sort() calls the key once per record, so the None-normalization runs
+    # exactly len(records) times.
+    records.sort(key=lambda rec: (rec.channel_name or "", rec.code or ""))
+
+    WRITERS[args.format](records, created_rec, sys.stdout)
     return 0
 
 
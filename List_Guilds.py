@@ -4,14 +4,91 @@
 
 import argparse
 import asyncio
+import csv
 import getpass
+import io
 import json
 import os
 import sys
 from collections.abc import Callable
+from operator import itemgetter
 from typing import Any
 
-import discord  # pyright: ignore[reportMissingImports]
+import aiohttp  # pyright: ignore[reportMissingImports]
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # pyright: ignore[reportMissingImports]
+
+    # 2-4x faster asyncio socket I/O; unavailable on Windows.
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
+API_BASE_URL = "https://discord.com/api/v10"
+GUILD_PAGE_LIMIT = 200
+RETRYABLE_HTTP_STATUSES = {429, 500, 502, 503, 504, 524}
+
+
+class RestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+def build_http_connector() -> aiohttp.TCPConnector:
+    return aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=64,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+    )
+
+
+async def rest_get_json(
+    session: aiohttp.ClientSession,
+    path: str,
+    *,
+    params: dict[str, str] | None = None,
+    label: str,
+    attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 8.0,
+    verbose: Callable[[str], None] | None = None,
+) -> Any:
+    for attempt in range(1, attempts + 1):
+        async with session.get(API_BASE_URL + path, params=params) as resp:
+            if resp.status < 400:
+                data = await resp.json()
+                if attempt > 1 and verbose is not None:
+                    verbose(f"{label} succeeded on attempt {attempt}/{attempts}.")
+                return data
+            message = await resp.text()
+            if attempt >= attempts or resp.status not in RETRYABLE_HTTP_STATUSES:
+                raise RestError(resp.status, message)
+            delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
+            if resp.status == 429:
+                # Honor the server's advertised wait instead of guessing.
+                raw = resp.headers.get("X-RateLimit-Reset-After") or resp.headers.get(
+                    "Retry-After"
+                )
+                if raw:
+                    try:
+                        delay = max(0.0, float(raw))
+                    except ValueError:
+                        pass
+            print(
+                f"Warning: {label} failed with HTTP {resp.status} on attempt "
+                f"{attempt}/{attempts}; retrying in {delay:.1f}s.",
+                file=sys.stderr,
+            )
+        await asyncio.sleep(delay)
+
+    raise RuntimeError(f"rest_get_json exhausted attempts for {label}")
 
 
 def build_verbose_printer(enabled: bool) -> Callable[[str], None]:
@@ -104,11 +181,83 @@ def prompt_token_with_mask(prompt: str = "Bot token: ") -> str:
         termios.tcsetattr(fd, termios.TCSADRAIN, original_settings)
 
 
+def _write_json(guilds: list[dict[str, Any]], args: argparse.Namespace, stream) -> None:
+    if orjson is not None:
+        stream.buffer.write(orjson.dumps(guilds, option=orjson.OPT_INDENT_2))
+        stream.buffer.write(b"\n")
+    else:
+        json.dump(guilds, stream, indent=2)
+        stream.write("\n")
+
+
+def _write_csv(guilds: list[dict[str, Any]], args: argparse.Namespace, stream) -> None:
+    headers = ["id", "name"]
+    if args.include_owner:
+        headers.append("owner_id")
+    if args.include_counts:
+        headers.append("member_count")
+    # Buffer the whole block so thousands of rows become a single write().
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(headers)
+    for g in guilds:
+        row: list[Any] = [g.get("id", ""), g.get("name", "") or ""]
+        if args.include_owner:
+            row.append(g.get("owner_id") or "")
+        if args.include_counts:
+            row.append(g.get("member_count") or "")
+        writer.writerow(row)
+    stream.write(buf.getvalue())
+
+
+def _write_text(guilds: list[dict[str, Any]], args: argparse.Namespace, stream) -> None:
+    # Buffer the whole block so thousands of rows become a single write().
+    buf = io.StringIO()
+    if not guilds:
+        buf.write("No guilds found.\n")
+    else:
+        for g in guilds:
+            parts = [f'{g["name"]} ({g["id"]})']
+            if args.include_owner and g.get("owner_id") is not None:
+                parts.append(f'owner_id={g["owner_id"]}')
+            if args.include_counts and g.get("member_count") is not None:
+                parts.append(f'member_count={g["member_count"]}')
+            buf.write(" • " + "  ".join(parts) + "\n")
+    stream.write(buf.getvalue())
+
+
+WRITERS = {"json": _write_json, "csv": _write_csv, "text": _write_text}
+
+
+def read_token_file(path: str) -> str | None:
+    """Read a bot token from a file: plain text or JSON with a "token" key."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            raw = fh.read().strip()
+    except OSError as exc:
+        print(f"Error: Could not read token file: {exc}", file=sys.stderr)
+        return None
+    if not raw:
+        return None
+    if raw.startswith("{"):
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        token = data.get("token")
+        return token.strip() if isinstance(token, str) else None
+    return raw.splitlines()[0].strip()
+
+
 def build_argparser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="List all Discord guilds (servers) a bot is in."
     )
     p.add_argument("--token", help="Bot token. If omitted, prompts.")
+    p.add_argument(
+        "--token-file",
+        help='Read the bot token from this file (plain text or JSON with a "token" key).',
+    )
     p.add_argument(
         "--format",
         choices=["text", "json", "csv"],
@@ -118,12 +267,12 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument(
         "--include-counts",
         action="store_true",
-        help="Include member_count (may be approximate without Members intent).",
+        help="Include member_count (approximate, as reported by the REST API).",
     )
     p.add_argument(
         "--include-owner",
         action="store_true",
-        help="Include owner_id (no additional permissions required).",
+        help="Include owner_id (fetches each guild's full object, one request per guild).",
     )
     p.add_argument(
         "--verbose",
@@ -137,6 +286,11 @@ async def main() -> int:
     args = build_argparser().parse_args()
     verbose = build_verbose_printer(args.verbose)
     token = args.token
+    if not token and args.token_file:
+        token = read_token_file(args.token_file)
+        if not token:
+            print("Error: No bot token found in token file.", file=sys.stderr)
+            return 2
     if not token:
         try:
             token = prompt_token_with_mask("Bot token: ")
@@ -147,84 +301,80 @@ async def main() -> int:
         print("Error: No bot token provided.", file=sys.stderr)
         return 2
 
-    intents = discord.Intents.none()
-    intents.guilds = True
-
-    client = discord.Client(intents=intents)
+    # The guild list only needs GET /users/@me/guilds; connecting the gateway
+    # would stream a GUILD_CREATE for every guild just to throw it away.
+    guilds: list[dict[str, Any]] = []
+    base_params = {"limit": str(GUILD_PAGE_LIMIT)}
+    if args.include_counts:
+        base_params["with_counts"] = "true"
 
-    done = asyncio.get_running_loop().create_future()
-    data: dict[str, list[dict[str, Any]]] = {"guilds": []}
+    async with aiohttp.ClientSession(
+        connector=build_http_connector(),
+        headers={"Authorization": f"Bot {token}"},
+    ) as session:
+        verbose("Fetching guild pages over REST (no gateway connection needed).")
+        after: int | None = None
+        while True:
+            params = dict(base_params)
+            if after is not None:
+                params["after"] = str(after)
+            try:
+                page = await rest_get_json(
+                    session,
+                    "/users/@me/guilds",
+                    params=params,
+                    label="fetching guild page",
+                    verbose=verbose,
+                )
+            except RestError as exc:
+                if exc.status == 401:
+                    print("Error: Invalid bot token.", file=sys.stderr)
+                    return 3
+                print(f"Error: HTTP error when listing guilds: {exc}", file=sys.stderr)
+                return 1
 
-    @client.event
-    async def on_ready():
-        try:
-            verbose(f"Logged in as {client.user} (id: {client.user.id})")
-            verbose(f"Reading {len(client.guilds)} guild(s) from the ready cache.")
-            for g in client.guilds:
+            for g in page:
                 item = {
-                    "id": g.id,
-                    "name": g.name,
+                    "id": int(g["id"]),
+                    "name": g.get("name"),
+                    # Normalized once here so the sort key is a plain dict lookup.
+                    "_sortkey": (g.get("name") or "").lower(),
                 }
                 if args.include_owner:
-                    item["owner_id"] = getattr(g, "owner_id", None)
+                    item["owner_id"] = None
                 if args.include_counts:
-                    item["member_count"] = getattr(g, "member_count", None)
-                data["guilds"].append(item)
+                    item["member_count"] = g.get("approximate_member_count")
+                guilds.append(item)
 
-            data["guilds"].sort(key=lambda x: (x["name"] or "").lower())
-            verbose(f"Prepared {len(data['guilds'])} guild record(s).")
-            done.set_result(True)
-        except Exception as exc:
-            done.set_exception(exc)
+            if len(page) < GUILD_PAGE_LIMIT:
+                break
+            after = int(page[-1]["id"])
+            verbose(f"Fetched {len(guilds)} guild(s) so far; paging after {after}.")
 
-    async def run():
-        try:
-            await client.start(token)
-        except discord.LoginFailure:
-            print("Error: Invalid bot token.", file=sys.stderr)
-            return 3
-        return 0
-
-    task = asyncio.create_task(run())
-    await asyncio.wait({done}, return_when=asyncio.ALL_COMPLETED)
-    await client.close()
-    try:
-        await task
-    except Exception:
-        pass
-
-    fmt = args.format
-    guilds = data["guilds"]
-
-    if fmt == "json":
-        json.dump(guilds, sys.stdout, indent=2)
-        print()
-    elif fmt == "csv":
-        headers = ["id", "name"]
-        if args.include_owner:
-            headers.append("owner_id")
-        if args.include_counts:
-            headers.append("member_count")
-        print(",".join(headers))
-        for g in guilds:
-            row = [str(g.get("id", "")), (g.get("name", "") or "").replace(",", " ")]
-            if args.include_owner:
-                row.append(str(g.get("owner_id", "")))
-            if args.include_counts:
-                row.append(str(g.get("member_count", "")))
-            print(",".join(row))
-    else:
-        if not guilds:
-            print("No guilds found.")
-        else:
-            for g in guilds:
-                parts = [f'{g["name"]} ({g["id"]})']
-                if args.include_owner and g.get("owner_id") is not None:
-                    parts.append(f'owner_id={g["owner_id"]}')
-                if args.include_counts and g.get("member_count") is not None:
-                    parts.append(f'member_count={g["member_count"]}')
-                print(" • " + "  ".join(parts))
+        if args.include_owner and guilds:
+            # The partial guild objects from /users/@me/guilds only carry an
+            # "owner" boolean; the full guild object is needed for owner_id.
+            verbose("Fetching full guild objects for owner IDs (one request each).")
+            for item in guilds:
+                try:
+                    full = await rest_get_json(
+                        session,
+                        f"/guilds/{item['id']}",
+                        label=f"fetching guild {item['id']}",
+                        verbose=verbose,
+                    )
+                except RestError as exc:
+                    verbose(f"Could not fetch guild {item['id']}: {exc}")
+                    continue
+                raw_owner = full.get("owner_id")
+                item["owner_id"] = int(raw_owner) if raw_owner is not None else None
+
+    guilds.sort(key=itemgetter("_sortkey"))
+    for item in guilds:
+        del item["_sortkey"]
+    verbose(f"Prepared {len(guilds)} guild record(s).")
 
+    WRITERS[args.format](guilds, args, sys.stdout)
     return 0
 
 